@@ -0,0 +1,122 @@
+"""Test points and tracks."""
+import itertools
+import math
+
+import gpxpy
+import pytest
+
+import track2route
+
+
+def make_gpxtrack(coordinates) -> gpxpy.gpx.GPXTrack:
+    """Create a GPXTrack with a single segment.
+
+    Args:
+        coordinates: Iterable of (latitude, longitude) tuples.
+    Returns:
+        gpxpy.gpx.GPXTrack: The created track.
+    """
+    track = gpxpy.gpx.GPXTrack()
+    segment = gpxpy.gpx.GPXTrackSegment()
+    segment.points = [gpxpy.gpx.GPXTrackPoint(lat, lon) for lat, lon in coordinates]
+    track.segments.append(segment)
+    return track
+
+
+ZIGZAG = [(47.0, 8.0), (47.0, 8.001), (47.0, 8.002), (47.001, 8.002), (47.001, 8.003)]
+
+
+def test_point_angle():
+    """Straight points have an angle of pi and corners of about pi/2."""
+    points = [track2route.Point(p) for p in make_gpxtrack(ZIGZAG).segments[0].points]
+    for previous_point, point in itertools.pairwise(points):
+        previous_point.next_point = point
+        point.previous_point = previous_point
+    assert math.isnan(points[0].angle)
+    assert points[1].angle == pytest.approx(math.pi, abs=1e-4)
+    assert points[2].angle == pytest.approx(math.pi / 2, abs=0.01)
+    assert points[1].distance_to_next == pytest.approx(76.0, abs=0.5)
+    assert points[2].distance_to_previous == points[1].distance_to_next
+
+
+def test_to_route():
+    """Straight points are removed first, start and end are kept."""
+    track = track2route.Track.from_gpxtrack(make_gpxtrack(ZIGZAG), name="test")
+    route = track.to_route(3)
+    assert route.name == "test"
+    assert [(p.latitude, p.longitude) for p in route.points] == [
+        ZIGZAG[0],
+        ZIGZAG[2],
+        ZIGZAG[-1],
+    ]
+
+
+LONG_ZIGZAG = [
+    (47.0, 8.0),
+    (47.0002, 8.001),
+    (47.0, 8.002),
+    (47.0011, 8.0031),
+    (47.0003, 8.004),
+    (47.0004, 8.0052),
+    (47.0021, 8.0058),
+    (47.0019, 8.007),
+    (47.0031, 8.0074),
+    (47.0029, 8.0091),
+    (47.0041, 8.0097),
+    (47.004, 8.011),
+]
+
+
+def test_to_route_outdated_angles():
+    """Outdated angles of neighbours of removed points are skipped.
+
+    Removing (47.0011, 8.0031) makes the angle at (47.0004, 8.0052)
+    smaller, its previous, bigger angle is the next one to come up and must
+    be skipped. The expected route was calculated by recalculating all
+    angles after each removal.
+    """
+    track = track2route.Track.from_gpxtrack(make_gpxtrack(LONG_ZIGZAG))
+    route = track.to_route(7)
+    assert [(p.latitude, p.longitude) for p in route.points] == [
+        (47.0, 8.0),
+        (47.0021, 8.0058),
+        (47.0019, 8.007),
+        (47.0031, 8.0074),
+        (47.0029, 8.0091),
+        (47.0041, 8.0097),
+        (47.004, 8.011),
+    ]
+
+
+def test_remove_n_compacts_heap(monkeypatch):
+    """Compacting the heap shrinks it without changing the route."""
+    uncompacted = track2route.Track.from_gpxtrack(make_gpxtrack(LONG_ZIGZAG))
+    monkeypatch.setattr(uncompacted, "_compact_heap", lambda: None)
+    uncompacted.remove_n(len(LONG_ZIGZAG) - 3)
+    track = track2route.Track.from_gpxtrack(make_gpxtrack(LONG_ZIGZAG))
+    track.remove_n(len(LONG_ZIGZAG) - 3)
+    assert [(p.latitude, p.longitude) for p in track.points] == [
+        (p.latitude, p.longitude) for p in uncompacted.points
+    ]
+    assert len(track._heap) < len(uncompacted._heap)
+
+
+def test_to_route_all_points():
+    """All points are kept by default."""
+    track = track2route.Track.from_gpxtrack(make_gpxtrack(ZIGZAG))
+    assert len(track.to_route().points) == len(ZIGZAG)
+
+
+def test_simplify():
+    """Points close to the straight line are removed, corners are kept."""
+    coordinates = [(47.0, 8.0), (47.00005, 8.001), (47.0, 8.002), (47.002, 8.002)]
+    track = track2route.Track.from_gpxtrack(make_gpxtrack(coordinates))
+    track.simplify(max_distance=10.0)
+    assert len(track) == 3
+    assert [(p.latitude, p.longitude) for p in track.points] == [
+        coordinates[0],
+        coordinates[2],
+        coordinates[3],
+    ]
+    track.simplify(max_distance=1000.0)
+    assert len(track) == 2
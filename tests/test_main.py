@@ -0,0 +1,42 @@
+"""Test the command line tool."""
+import io
+import xml.etree.ElementTree as ET
+
+import gpxpy
+import pytest
+
+from track2route.__main__ import write_gpx
+
+
+@pytest.mark.parametrize(
+    "version, with_extensions", [(None, False), ("1.0", False), ("1.1", True)]
+)
+def test_write_gpx(version, with_extensions):
+    """Streamed output is identical to gpxpy's serialization."""
+    gpxfile = gpxpy.gpx.GPX()
+    gpxfile.name = "test"
+    gpxfile.version = version
+    if with_extensions:
+        gpxfile.nsmap["test"] = "http://example.com/test"
+        extension = ET.Element("{http://example.com/test}info")
+        extension.text = "extension"
+        gpxfile.extensions.append(extension)
+    gpxfile.waypoints.append(gpxpy.gpx.GPXWaypoint(47.0, 8.0, name="start"))
+    track = gpxpy.gpx.GPXTrack(name="track")
+    track.segments.append(gpxpy.gpx.GPXTrackSegment())
+    track.segments[0].points = [
+        gpxpy.gpx.GPXTrackPoint(47.0, 8.0 + i * 0.001, elevation=i) for i in range(5)
+    ]
+    gpxfile.tracks.append(track)
+    route = gpxpy.gpx.GPXRoute(name="route")
+    route.points = track.segments[0].points[::2]
+    gpxfile.routes.append(route)
+    expected = gpxfile.to_xml()
+
+    file = io.StringIO()
+    write_gpx(gpxfile, file)
+    assert file.getvalue() == expected
+    assert gpxfile.routes == [route]
+    assert gpxfile.tracks == [track]
+    if with_extensions:
+        assert "<test:info>extension</test:info>" in expected
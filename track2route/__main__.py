@@ -2,12 +2,46 @@
 
 import argparse
 import pathlib
+from typing import TextIO
 
 import gpxpy
+import gpxpy.gpxfield
 
 import track2route
 
 
+def write_gpx(gpxfile: gpxpy.gpx.GPX, file: TextIO):
+    """Write GPX to a file, serializing routes and tracks one at a time.
+
+    gpxpy can only serialize the whole document into a single string. To
+    avoid holding it in memory, the document is serialized without routes
+    and tracks and these are written in between one after another.
+
+    Args:
+        gpxfile (gpxpy.gpx.GPX): GPX to write.
+        file (TextIO): File opened for writing.
+    """
+    routes, tracks = gpxfile.routes, gpxfile.tracks
+    gpxfile.routes, gpxfile.tracks = [], []
+    try:
+        skeleton = gpxfile.to_xml()
+    finally:
+        gpxfile.routes, gpxfile.tracks = routes, tracks
+    # Routes and tracks are followed by the extensions of the root element.
+    head, closing, tail = skeleton.rpartition("\n  <extensions>")
+    if not closing:
+        head, closing, tail = skeleton.rpartition("\n</gpx>")
+    file.write(head)
+    file.writelines(
+        gpxpy.gpxfield.gpx_fields_to_xml(
+            element, tag, gpxfile.version, nsmap=gpxfile.nsmap, indent="  "
+        )
+        for tag, elements in (("rte", routes), ("trk", tracks))
+        for element in elements
+    )
+    file.write(closing + tail)
+
+
 def main():
     """Main function."""
     parser = argparse.ArgumentParser(
@@ -35,7 +69,9 @@ def main():
     parser.add_argument(
         "--simplify",
         action="store_true",
-        help="Simplify track beforehand using Ramer-Douglas-Peucker algorithm from gpxpy",
+        help="Simplify track beforehand using Ramer-Douglas-Peucker algorithm. "
+        "All segments of a track are simplified together as one line. Only the "
+        "routes are simplified, the tracks in the output file are unchanged.",
     )
     parser.add_argument(
         "--max_distance",
@@ -48,15 +84,15 @@ def main():
     with pathlib.Path(args.infile).open("r") as file:
         gpxfile = gpxpy.parse(file)
     for track in gpxfile.tracks:
-        if args.simplify:
-            track.simplify(max_distance=args.max_distance)
         new_track = track2route.Track.from_gpxtrack(
             track, name=track.name, description=track.description
         )
+        if args.simplify:
+            new_track.simplify(max_distance=args.max_distance)
         route = new_track.to_route(args.routepoints)
         gpxfile.routes.append(route)
     with pathlib.Path(args.outfile).open("w") as file:
-        file.write(gpxfile.to_xml())
+        write_gpx(gpxfile, file)
 
 
 if __name__ == "__main__":
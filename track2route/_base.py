@@ -1,11 +1,15 @@
 """Points and tracks used to convert to routes."""
 
+import heapq
+import itertools
 import math
+import operator
 from typing import Any, Dict, Iterable, List, Optional
 
 import gpxpy
-import sortedcontainers
-from geopy.distance import geodesic
+import numpy as np
+
+from track2route import _kernels
 
 
 class Point:
@@ -13,8 +17,23 @@ class Point:
 
     It also allows to calculate the angle between previous and next point
     and the distance to another point.
+
+    This is a standalone helper, :class:`Track` does not use it and expects
+    plain GPX track points instead.
     """
 
+    __slots__ = (
+        "_angle",
+        "_cos_lat",
+        "_dist_skip",
+        "_dist_to_next",
+        "_lat_rad",
+        "_lon_rad",
+        "_next_point",
+        "_previous_point",
+        "point",
+    )
+
     def __init__(
         self,
         point: gpxpy.gpx.GPXTrackPoint,
@@ -30,8 +49,13 @@ class Point:
         """
         self._previous_point = previous_point
         self.point = point
+        self._lat_rad = math.radians(point.latitude)
+        self._lon_rad = math.radians(point.longitude)
+        self._cos_lat = math.cos(self._lat_rad)
         self._next_point = next_point
         self._angle = float("nan")
+        self._dist_to_next = float("nan")
+        self._dist_skip = float("nan")
 
     def distance_to(self, other: Optional["Point"]) -> float:
         """Calculate distance to other Point instance.
@@ -40,18 +64,15 @@ class Point:
             other (Point): Other point for distance calculation.
 
         Returns:
-            float: geodesic distance in metre between points.
+            float: Haversine distance in metre between points.
                 Can be nan if `other` is None.
         """
         if other is None:
             return float("nan")
-        return (
-            geodesic(
-                (self.point.latitude, self.point.longitude),
-                (other.point.latitude, other.point.longitude),
-            ).km
-            * 1000.0
-        )
+        sin_lat = math.sin((other._lat_rad - self._lat_rad) / 2.0)
+        sin_lon = math.sin((other._lon_rad - self._lon_rad) / 2.0)
+        a = sin_lat * sin_lat + self._cos_lat * other._cos_lat * sin_lon * sin_lon
+        return 2.0 * _kernels.EARTH_RADIUS * math.asin(math.sqrt(min(1.0, a)))
 
     @property
     def next_point(self) -> Optional["Point"]:
@@ -65,6 +86,8 @@ class Point:
     @next_point.setter
     def next_point(self, new_point):
         self._angle = float("nan")
+        self._dist_to_next = float("nan")
+        self._dist_skip = float("nan")
         self._next_point = new_point
 
     @property
@@ -79,6 +102,7 @@ class Point:
     @previous_point.setter
     def previous_point(self, new_point):
         self._angle = float("nan")
+        self._dist_skip = float("nan")
         self._previous_point = new_point
 
     @property
@@ -88,7 +112,10 @@ class Point:
         Returns:
             float: Distance to previous point in metre.
         """
-        return self.distance_to(self.previous_point)
+        previous_point = self.previous_point
+        if previous_point is not None and previous_point.next_point is self:
+            return previous_point.distance_to_next
+        return self.distance_to(previous_point)
 
     @property
     def distance_to_next(self) -> float:
@@ -97,7 +124,15 @@ class Point:
         Returns:
             float: Distance to next point in metre.
         """
-        return self.distance_to(self.next_point)
+        if math.isnan(self._dist_to_next):
+            self._dist_to_next = self.distance_to(self.next_point)
+        return self._dist_to_next
+
+    @property
+    def _distance_skip(self) -> float:
+        if math.isnan(self._dist_skip) and self.previous_point is not None:
+            self._dist_skip = self.previous_point.distance_to(self.next_point)
+        return self._dist_skip
 
     @property
     def angle(self) -> float:
@@ -106,57 +141,161 @@ class Point:
         Returns:
             float: Angle in degree.
         """
-        if self.next_point is None or self.previous_point is None:
+        if self._next_point is None or self._previous_point is None:
             return float("nan")
-        if math.isnan(self._angle):
+        angle = self._angle
+        if math.isnan(angle):
             distance_a = self.distance_to_previous
             distance_b = self.distance_to_next
-            cos_gamma = (
-                distance_a**2
-                + distance_b**2
-                - self.previous_point.distance_to(self.next_point) ** 2
-            )
-            try:
-                cos_gamma /= 2 * distance_a * distance_b
-            except ZeroDivisionError:
-                self._angle = math.pi
+            distance_c = self._distance_skip
+            denominator = 2.0 * distance_a * distance_b
+            if denominator == 0.0:
+                angle = math.pi
             else:
-                self._angle = math.acos(cos_gamma)
-        return self._angle
-
-
-def _sort_order(point):
-    angle = point.angle
-    return -1 if math.isnan(angle) else angle
+                cos_gamma = (
+                    distance_a * distance_a
+                    + distance_b * distance_b
+                    - distance_c * distance_c
+                ) / denominator
+                angle = math.acos(max(-1.0, min(1.0, cos_gamma)))
+            self._angle = angle
+        return angle
 
 
 class Track:
-    """Track which can be converted to a route."""
+    """Track which can be converted to a route.
+
+    The track is stored as structure of arrays: coordinates are kept in
+    NumPy arrays and the track order in arrays with the index of the
+    previous and next point, where -1 marks the start and the end.
+    """
 
-    start_point: Point
     desc: Dict[str, Any]
 
-    def __init__(self, points: Iterable[Point], **kwargs):
+    def __init__(self, points: Iterable[gpxpy.gpx.GPXTrackPoint], **kwargs):
         """Store points and sort them by angle
 
         Args:
-            points (Iterable[Point]): Points for the track.
+            points (Iterable[gpxpy.gpx.GPXTrackPoint]): Points in track order.
             kwargs: Additional informations for the track.
         """
-        self._points = list(points)
-        self.start_point = self._points[0]
-        self._points = sortedcontainers.SortedList(self._points, key=_sort_order)
+        if isinstance(points, np.ndarray):
+            self._original_points = points
+        else:
+            self._original_points = np.fromiter(
+                points, dtype=object, count=operator.length_hint(points, -1)
+            )
+        n_points = self._original_points.size
+        self._lat = np.radians(
+            np.fromiter(
+                (p.latitude for p in self._original_points), np.float64, n_points
+            )
+        )
+        self._lon = np.radians(
+            np.fromiter(
+                (p.longitude for p in self._original_points), np.float64, n_points
+            )
+        )
+        self._cos_lat = np.cos(self._lat)
         self.desc = kwargs
+        self._link(np.arange(n_points, dtype=np.int32))
+
+    def _link(self, indices: np.ndarray):
+        """Link the given points in order and sort them by angle.
+
+        All other points are marked as removed.
+
+        Args:
+            indices (np.ndarray): Indices of the points in track order.
+        """
+        n_total = self._lat.size
+        self._prev_idx = np.full(n_total, -1, dtype=np.int32)
+        self._next_idx = np.full(n_total, -1, dtype=np.int32)
+        self._prev_idx[indices[1:]] = indices[:-1]
+        self._next_idx[indices[:-1]] = indices[1:]
+        self._alive = np.zeros(n_total, dtype=np.bool_)
+        self._alive[indices] = True
+        # Distances and angles of all points in one vectorized pass over the
+        # coordinates gathered in track order.
+        lat = self._lat[indices]
+        lon = self._lon[indices]
+        cos_lat = self._cos_lat[indices]
+        dist_next = np.empty(indices.size - 1)
+        _kernels.haversine_pairs(
+            lat[:-1], lon[:-1], cos_lat[:-1], lat[1:], lon[1:], cos_lat[1:], dist_next
+        )
+        dist_skip = np.empty(max(indices.size - 2, 0))
+        _kernels.haversine_pairs(
+            lat[:-2], lon[:-2], cos_lat[:-2], lat[2:], lon[2:], cos_lat[2:], dist_skip
+        )
+        self._dist_next = np.full(n_total, np.nan)
+        self._dist_next[indices[:-1]] = dist_next
+        self._dist_skip = np.full(n_total, np.nan)
+        self._dist_skip[indices[1:-1]] = dist_skip
+        self._angles = np.full(n_total, np.nan)
+        self._angles[indices[1:-1]] = _kernels.angles_from_distances(
+            dist_next[:-1], dist_next[1:], dist_skip
+        )
+        # Sort key per point: the angle, or -1 for start and end point.
+        sort_keys = np.where(np.isnan(self._angles), -1.0, self._angles)
+        # Max-heap of (-sort key, -insertion counter, index) with lazy
+        # deletion: the counter of the latest entry of each point is kept as
+        # its version, -1 for removed points, and entries with another
+        # counter are skipped on pop. Among equal angles the most recently
+        # pushed entry wins.
+        self._heap = list(
+            zip(
+                (-sort_keys[indices]).tolist(),
+                (-indices).tolist(),
+                indices.tolist(),
+            )
+        )
+        heapq.heapify(self._heap)
+        self._versions = np.where(self._alive, np.arange(n_total), -1).tolist()
+        self._counter = n_total
+        self._n_points = indices.size
+
+    def _indices(self) -> np.ndarray:
+        # Removing points never changes the order of the remaining ones, so
+        # the remaining indices in ascending order are in track order.
+        return np.flatnonzero(self._alive).astype(np.int32)
+
+    def simplify(self, max_distance: float = 10.0):
+        """Simplify the track using the Ramer-Douglas-Peucker algorithm.
+
+        The track is simplified as one line, also across the boundaries of
+        the GPX segments it was created from. Only this track is changed,
+        the GPX track points and segments are left unchanged.
+
+        Args:
+            max_distance (float, optional): Maximum distance in metre of a
+                removed point to the simplified track. Defaults to 10.
+        """
+        indices = self._indices()
+        keep = _kernels.simplify_mask(
+            self._lat[indices], self._lon[indices], max_distance
+        )
+        self._link(indices[keep])
+
+    def _push(self, index):
+        angle = float(self._angles[index])
+        key = -1.0 if math.isnan(angle) else angle
+        counter = self._counter
+        self._versions[index] = counter
+        heapq.heappush(self._heap, (-key, -counter, index))
+        self._counter = counter + 1
+
+    def _compact_heap(self):
+        """Drop outdated entries and rebuild the heap in one pass."""
+        versions = self._versions
+        self._heap[:] = [
+            entry for entry in self._heap if versions[entry[2]] == -entry[1]
+        ]
+        heapq.heapify(self._heap)
 
     def remove(self):
         """Remove the point with the biggest angle."""
-        point_to_remove = self._points.pop(-1)
-        self._points.discard(point_to_remove.next_point)
-        self._points.discard(point_to_remove.previous_point)
-        point_to_remove.previous_point.next_point = point_to_remove.next_point
-        point_to_remove.next_point.previous_point = point_to_remove.previous_point
-        self._points.add(point_to_remove.previous_point)
-        self._points.add(point_to_remove.next_point)
+        self.remove_n(1)
 
     def remove_n(self, n_points: int):
         """Remove `n` points from the track.
@@ -167,9 +306,48 @@ class Track:
             n_points (int): Number of points to remove.
 
         """
-        assert n_points <= len(self._points) - 2
+        assert n_points <= len(self) - 2
+        # Avoid repeated attribute lookups in the loop.
+        heap = self._heap
+        heappop = heapq.heappop
+        push = self._push
+        update_angle = _kernels.update_angle
+        alive = self._alive
+        versions = self._versions
+        lat, lon, cos_lat = self._lat, self._lon, self._cos_lat
+        prev_idx, next_idx = self._prev_idx, self._next_idx
+        dist_next, dist_skip = self._dist_next, self._dist_skip
+        angles = self._angles
+        remaining = self._n_points
         for _ in range(n_points):
-            self.remove()
+            if len(heap) > 2 * remaining:
+                self._compact_heap()
+            while True:
+                _, counter, index = heappop(heap)
+                if versions[index] == -counter:
+                    break
+            previous_index = int(prev_idx[index])
+            next_index = int(next_idx[index])
+            next_idx[previous_index] = next_index
+            prev_idx[next_index] = previous_index
+            dist_next[previous_index] = dist_skip[index]
+            alive[index] = False
+            versions[index] = -1
+            for neighbour in (previous_index, next_index):
+                update_angle(
+                    lat,
+                    lon,
+                    cos_lat,
+                    prev_idx,
+                    next_idx,
+                    dist_next,
+                    dist_skip,
+                    angles,
+                    neighbour,
+                )
+                push(neighbour)
+            remaining -= 1
+        self._n_points = remaining
 
     @property
     def points(self) -> List[gpxpy.gpx.GPXTrackPoint]:
@@ -178,15 +356,10 @@ class Track:
         Retursns:
             List[gpxpy.gpx.GPXTrackPoint]: List of points in track order.
         """
-        points = []
-        point: Optional[Point] = self.start_point
-        while point is not None:
-            points.append(point.point)
-            point = point.next_point
-        return points
+        return self._original_points[self._indices()].tolist()
 
     def __len__(self):
-        return len(self._points)
+        return self._n_points
 
     @classmethod
     def from_gpxtrack(cls, track: gpxpy.gpx.GPXTrack, **kwargs) -> "Track":
@@ -195,19 +368,13 @@ class Track:
         Returns:
             Track: Coverted GPXTrack
         """
-        points = []
-        for segment in track.segments:
-            for point in segment.points:
-                points.append(Point(point))
-
-        assert len(points) >= 3
-
-        points[0].next_point = points[1]
-        points[-1].previous_point = points[-2]
-
-        for i in range(1, len(points) - 1):
-            points[i].previous_point = points[i - 1]
-            points[i].next_point = points[i + 1]
+        n_points = sum(len(segment.points) for segment in track.segments)
+        assert n_points >= 3
+        points = np.fromiter(
+            itertools.chain.from_iterable(segment.points for segment in track.segments),
+            dtype=object,
+            count=n_points,
+        )
         return cls(points=points, **kwargs)
 
     def to_route(self, n_points: int = -1) -> gpxpy.gpx.GPXRoute:
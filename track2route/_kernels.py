@@ -0,0 +1,141 @@
+"""Kernels for calculations on coordinate arrays.
+
+All coordinates are given in radians together with the cosine of the
+latitude. Points are linked by index arrays, where -1 marks a missing
+neighbour.
+"""
+
+import math
+
+import numpy as np
+from numba import njit, prange
+
+EARTH_RADIUS = 6371000.0
+
+
+@njit(cache=True, fastmath=True)
+def haversine(lat1, lon1, cos_lat1, lat2, lon2, cos_lat2):
+    """Haversine distance in metre between two coordinates.
+
+    The cosines of the latitudes are passed in precomputed.
+    """
+    sin_lat = math.sin((lat2 - lat1) / 2.0)
+    sin_lon = math.sin((lon2 - lon1) / 2.0)
+    a = sin_lat * sin_lat + cos_lat1 * cos_lat2 * sin_lon * sin_lon
+    return 2.0 * EARTH_RADIUS * math.asin(math.sqrt(min(1.0, a)))
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def haversine_pairs(lat1, lon1, cos_lat1, lat2, lon2, cos_lat2, out):
+    """Haversine distances between aligned coordinate arrays.
+
+    The pairs are independent and calculated in parallel, the distances are
+    written to `out`.
+    """
+    for i in prange(lat1.size):
+        out[i] = haversine(lat1[i], lon1[i], cos_lat1[i], lat2[i], lon2[i], cos_lat2[i])
+
+
+def angles_from_distances(distance_a, distance_b, distance_c):
+    """Element-wise angle between the sides `distance_a` and `distance_b`.
+
+    The angle is pi where one of these sides has zero length.
+    """
+    denominator = 2.0 * distance_a * distance_b
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cos_gamma = (distance_a**2 + distance_b**2 - distance_c**2) / denominator
+        angles = np.arccos(np.clip(cos_gamma, -1.0, 1.0))
+    return np.where(denominator == 0.0, np.pi, angles)
+
+
+@njit(cache=True, fastmath=True)
+def update_angle(
+    lat, lon, cos_lat, prev_idx, next_idx, dist_next, dist_skip, angles, i
+):
+    """Recalculate the angle at point `i` in place.
+
+    The distances to the neighbours are read from `dist_next`, only the
+    distance between previous and next point is recalculated and stored in
+    `dist_skip`. The angle is nan if point `i` has no previous or next point
+    and pi if it coincides with one of them.
+    """
+    previous = prev_idx[i]
+    following = next_idx[i]
+    if previous < 0 or following < 0:
+        angles[i] = np.nan
+        return
+    distance_a = dist_next[previous]
+    distance_b = dist_next[i]
+    distance_c = haversine(
+        lat[previous],
+        lon[previous],
+        cos_lat[previous],
+        lat[following],
+        lon[following],
+        cos_lat[following],
+    )
+    dist_skip[i] = distance_c
+    denominator = 2.0 * distance_a * distance_b
+    if denominator == 0.0:
+        angles[i] = math.pi
+        return
+    cos_gamma = (
+        distance_a * distance_a + distance_b * distance_b - distance_c * distance_c
+    ) / denominator
+    angles[i] = math.acos(max(-1.0, min(1.0, cos_gamma)))
+
+
+@njit(cache=True)
+def simplify_mask(lat, lon, max_distance):
+    """Ramer-Douglas-Peucker simplification of a polyline.
+
+    Segments are processed iteratively from a stack. Distances to the chord
+    of a segment are calculated on a local equirectangular projection.
+
+    Args:
+        lat (np.ndarray): Latitudes in radians.
+        lon (np.ndarray): Longitudes in radians.
+        max_distance (float): Maximum distance in metre of a removed point
+            to the simplified polyline.
+
+    Returns:
+        np.ndarray: Boolean mask of the points to keep.
+    """
+    keep = np.zeros(lat.size, dtype=np.bool_)
+    keep[0] = True
+    keep[-1] = True
+    stack = np.empty((lat.size, 2), dtype=np.int64)
+    stack[0, 0] = 0
+    stack[0, 1] = lat.size - 1
+    n_stack = 1
+    while n_stack > 0:
+        n_stack -= 1
+        low = stack[n_stack, 0]
+        high = stack[n_stack, 1]
+        if high - low < 2:
+            continue
+        cos_ref = math.cos((lat[low] + lat[high]) / 2.0)
+        chord_x = (lon[high] - lon[low]) * cos_ref
+        chord_y = lat[high] - lat[low]
+        chord = math.sqrt(chord_x * chord_x + chord_y * chord_y)
+        farthest = low + 1
+        max_found = -1.0
+        for i in range(low + 1, high):
+            delta_x = (lon[i] - lon[low]) * cos_ref
+            delta_y = lat[i] - lat[low]
+            if chord == 0.0:
+                distance = math.sqrt(delta_x * delta_x + delta_y * delta_y)
+            else:
+                distance = abs(chord_x * delta_y - chord_y * delta_x) / chord
+            if distance > max_found:
+                max_found = distance
+                farthest = i
+        if max_found * EARTH_RADIUS < max_distance:
+            continue
+        keep[farthest] = True
+        stack[n_stack, 0] = low
+        stack[n_stack, 1] = farthest
+        stack[n_stack + 1, 0] = farthest
+        stack[n_stack + 1, 1] = high
+        n_stack += 2
+    return keep